@@ -13,37 +13,38 @@ and safe formula evaluation to reduce operational risk and accelerate reporting
 """
 
 import argparse
+import heapq
 import sys
 import csv
 from pathlib import Path
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from src.parsers import GQParser
-from src.engine import MappingEngine
-from src.models import DSDDataPoint
+if TYPE_CHECKING:
+    from src.models import DSDDataPoint
 
+# GQParser and MappingEngine are imported inside main() after argument
+# parsing so that --help and argument errors do not pay the cost of
+# importing pandas and the rest of the processing stack
 
-def save_to_csv(data: List[DSDDataPoint], output_path: str) -> None:
+
+def save_to_csv(data: List["DSDDataPoint"], output_path: str) -> None:
     """Save mapped data to CSV file."""
     with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['dsd_code', 'value', 'description', 'formula']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for item in data:
-            writer.writerow({
-                'dsd_code': item.code,
-                'value': item.value,
-                'description': item.description,
-                'formula': item.formula
-            })
+        writer = csv.writer(csvfile)
+        writer.writerow(('dsd_code', 'value', 'description', 'formula'))
+        # writerows consumes the generator in C, avoiding per-row dict
+        # construction and field reordering from DictWriter.writerow
+        writer.writerows(
+            (item.code, item.value, item.description, item.formula)
+            for item in data
+        )
 
 
 def validate_inputs(args) -> None:
     """Validate command line arguments."""
-    if not Path(args.gq_file).exists():
-        raise FileNotFoundError(f"GQ file not found: {args.gq_file}")
-    
+    # GQ file existence is checked (and its stat cached) by GQParser, so
+    # there is no separate .exists() round trip here
+
     if args.report_type not in ['lbsr', 'lbsn']:
         raise ValueError(f"Invalid report type: {args.report_type}. Must be 'lbsr' or 'lbsn'")
     
@@ -111,7 +112,10 @@ Examples:
     )
     
     args = parser.parse_args()
-    
+
+    from src.parsers import GQParser
+    from src.engine import MappingEngine
+
     try:
         # Validate inputs
         validate_inputs(args)
@@ -126,18 +130,10 @@ Examples:
         parser_obj = GQParser(args.gq_file, args.gq_structure)
         engine = MappingEngine(args.mapping_rules)
         
-        if args.verbose:
-            print("Parsing GQ data...")
-        
-        # Parse GQ data
-        gq_data = parser_obj.parse()
-        
-        if args.verbose:
-            print(f"Parsed {len(gq_data)} GQ data points")
-        
-        # Validate mapping rules if requested
+        # Validate mapping rules if requested - only the set of available
+        # codes matters here, so skip the full parse and value conversions
         if args.validate_only:
-            errors = engine.validate_rules(list(gq_data.keys()))
+            errors = engine.validate_rules(list(parser_obj.list_codes()))
             if errors:
                 print("Validation errors found:")
                 for error in errors:
@@ -146,6 +142,15 @@ Examples:
             else:
                 print("All mapping rules validated successfully!")
                 return 0
+
+        if args.verbose:
+            print("Parsing GQ data...")
+
+        # Parse GQ data
+        gq_data = parser_obj.parse()
+
+        if args.verbose:
+            print(f"Parsed {len(gq_data)} GQ data points")
         
         # Validate rules first
         errors = engine.validate_rules(list(gq_data.keys()))
@@ -176,8 +181,10 @@ Examples:
             print(f"  Number of DSD codes: {len(mapped_data)}")
             
             print("\nTop 5 values:")
-            sorted_data = sorted(mapped_data, key=lambda x: abs(x.value), reverse=True)
-            for item in sorted_data[:5]:
+            # nlargest is O(N log 5) - no need to fully sort the report
+            # just to show the five biggest positions
+            top_items = heapq.nlargest(5, mapped_data, key=lambda x: abs(x.value))
+            for item in top_items:
                 print(f"  {item.code}: {item.value:,.2f} - {item.description}")
         
         return 0
@@ -0,0 +1,176 @@
+"""
+Minimal streaming xlsx reader for BIS GQ Mapper.
+
+Reads the first worksheet of an xlsx workbook using only the standard
+library: the file is opened as a zip archive and the sheet XML is fed in
+chunks to an expat SAX parser that handles just ``<row>``, ``<c>`` and
+``<v>`` elements (plus the shared-strings table). No element tree is ever
+built, so memory stays bounded by one row regardless of sheet size.
+
+Styles, formats, merged cells and formulas are ignored - only cell
+values are produced - which is all the GQ parsers need. Zip entries are
+DEFLATE-compressed, so the sheet is streamed through the archive reader
+rather than memory-mapped.
+"""
+
+import zipfile
+from typing import Iterator, List
+from xml.parsers import expat
+
+# Bytes of sheet XML fed to expat per step; completed rows are yielded
+# between steps
+_CHUNK_SIZE = 1 << 16
+
+
+def _read_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    """Parse xl/sharedStrings.xml into an index-addressable list."""
+    try:
+        source = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+
+    strings: List[str] = []
+    buf: List[str] = []
+    state = {'in_t': False}
+
+    def start(name, attrs):
+        if name == 't':
+            state['in_t'] = True
+        elif name == 'si':
+            buf.clear()
+
+    def chars(data):
+        if state['in_t']:
+            buf.append(data)
+
+    def end(name):
+        if name == 't':
+            state['in_t'] = False
+        elif name == 'si':
+            strings.append(''.join(buf))
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start
+    parser.CharacterDataHandler = chars
+    parser.EndElementHandler = end
+    with source as f:
+        parser.ParseFile(f)
+    return strings
+
+
+class _SheetHandler:
+    """Expat handlers that assemble cell values into row lists."""
+
+    __slots__ = ('shared', 'rows', 'row', 'col', 'next_col', 'ctype',
+                 'collect', 'buf')
+
+    def __init__(self, shared: List[str], rows: list):
+        self.shared = shared
+        self.rows = rows          # completed rows, drained by the caller
+        self.row: dict = {}       # column index -> value for the open row
+        self.col = 0
+        self.next_col = 0
+        self.ctype = None
+        self.collect = False
+        self.buf: List[str] = []
+
+    def start(self, name, attrs):
+        if name == 'c':
+            ref = attrs.get('r')
+            if ref:
+                # Column letters of the A1-style reference
+                col = 0
+                for ch in ref:
+                    if 'A' <= ch <= 'Z':
+                        col = col * 26 + (ord(ch) - 64)
+                    else:
+                        break
+                self.col = col - 1
+            else:
+                self.col = self.next_col
+            self.ctype = attrs.get('t')
+            self.buf = []
+        elif name in ('v', 't'):
+            self.collect = True
+        elif name == 'row':
+            self.row = {}
+            self.next_col = 0
+
+    def chars(self, data):
+        if self.collect:
+            self.buf.append(data)
+
+    def end(self, name):
+        if name in ('v', 't'):
+            self.collect = False
+        elif name == 'c':
+            self.row[self.col] = self._value(''.join(self.buf))
+            self.next_col = self.col + 1
+        elif name == 'row':
+            row = self.row
+            if row:
+                width = max(row) + 1
+                self.rows.append([row.get(i) for i in range(width)])
+
+    def _value(self, text: str):
+        """Convert collected cell text according to the cell type."""
+        if text == '':
+            return None
+        ctype = self.ctype
+        if ctype == 's':
+            return self.shared[int(text)]
+        if ctype in ('str', 'inlineStr'):
+            return text
+        if ctype == 'b':
+            return text == '1'
+        if ctype == 'e':
+            return None
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def _sheet_entry(zf: zipfile.ZipFile) -> str:
+    """Locate the first worksheet entry inside the archive."""
+    if 'xl/worksheets/sheet1.xml' in zf.namelist():
+        return 'xl/worksheets/sheet1.xml'
+    candidates = sorted(
+        name for name in zf.namelist()
+        if name.startswith('xl/worksheets/') and name.endswith('.xml')
+    )
+    if not candidates:
+        raise ValueError('No worksheet found in workbook')
+    return candidates[0]
+
+
+def iter_rows(path) -> Iterator[list]:
+    """
+    Stream rows of the first worksheet as lists of cell values.
+
+    Yields:
+        Lists of cell values, one per non-empty row; missing cells
+        within a row are None
+    """
+    with zipfile.ZipFile(path) as zf:
+        shared = _read_shared_strings(zf)
+        rows: list = []
+        handler = _SheetHandler(shared, rows)
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = handler.start
+        parser.CharacterDataHandler = handler.chars
+        parser.EndElementHandler = handler.end
+
+        with zf.open(_sheet_entry(zf)) as f:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                parser.Parse(chunk, not chunk)
+                if rows:
+                    yield from rows
+                    rows.clear()
+                if not chunk:
+                    return
@@ -0,0 +1,97 @@
+"""
+Configuration loading for BIS GQ Mapper.
+
+This module centralizes YAML configuration loading and adds an on-disk
+cache so repeated CLI invocations do not re-pay the YAML parse cost.
+"""
+
+import pickle
+import yaml
+from pathlib import Path
+from typing import Any
+
+# Prefer the libyaml C loader when PyYAML was built against it; it parses
+# identically to SafeLoader but several times faster.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson deserializes the JSON-compatible config dicts faster than pickle
+# and produces a portable sidecar; fall back to pickle when not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _cache_path(path: Path) -> Path:
+    """Return the sidecar cache path for a configuration file."""
+    suffix = ".cache.json" if orjson is not None else ".cache.pkl"
+    return path.with_suffix(path.suffix + suffix)
+
+
+def _cache_load(cache_file: Path) -> Any:
+    """Deserialize a sidecar cache file."""
+    with open(cache_file, "rb") as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return pickle.load(f)
+
+
+def _cache_dump(data: Any, cache_file: Path) -> None:
+    """Serialize a parsed config document to its sidecar cache file."""
+    if orjson is not None:
+        # Without the passthrough option orjson would serialize YAML
+        # timestamps natively, so a cached load would return strings
+        # where a cold load returns date objects; forcing a TypeError
+        # keeps date-bearing documents out of the cache instead
+        payload = orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    else:
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Serialize before opening so a failed dump cannot leave a truncated
+    # sidecar behind
+    with open(cache_file, "wb") as f:
+        f.write(payload)
+
+
+def load_yaml_cached(path) -> Any:
+    """
+    Load a YAML file, using a sidecar cache when it is fresh.
+
+    On first load the parsed document is written next to the source file:
+    as ``<name>.yaml.cache.json`` via orjson when it is installed, or as
+    a ``<name>.yaml.cache.pkl`` pickle otherwise. Subsequent loads
+    deserialize the sidecar instead, as long as the source file has not
+    been modified since — either format loads an order of magnitude
+    faster than re-parsing the YAML on every run.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML document
+    """
+    path = Path(path)
+    cache_file = _cache_path(path)
+    src_mtime = path.stat().st_mtime
+
+    try:
+        if cache_file.stat().st_mtime >= src_mtime:
+            return _cache_load(cache_file)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        # Missing, stale, or corrupt cache - fall through and re-parse
+        pass
+
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+
+    try:
+        _cache_dump(data, cache_file)
+    except (OSError, TypeError):
+        # Cache location not writable, or the document contains types the
+        # serializer cannot represent (e.g. YAML timestamps) - not fatal
+        pass
+
+    return data
@@ -5,14 +5,65 @@ This module contains the core logic engine that applies mapping rules
 to transform GQ data into DSD format.
 """
 
-import yaml
+import ast
+import os
 import re
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+from .config import load_yaml_cached
 from .models import DSDDataPoint
 
 
+# Matches the numeric GQ codes referenced in a formula string
+_CODE_RE = re.compile(r"\b\d+\b")
+
+# Rule count above which generate_report fans formula evaluation out to a
+# thread pool; below this the pool set-up costs more than it saves
+_PARALLEL_THRESHOLD = 500
+
+# AST node types permitted in mapping formulas. Anything outside this
+# whitelist (names, calls, comparisons, etc.) is rejected at compile time.
+_ALLOWED_FORMULA_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.UAdd,
+    ast.USub,
+    ast.Constant,
+)
+
+
+class _CodeLookupTransformer(ast.NodeTransformer):
+    """Rewrites integer literals in a formula AST into GQ data lookups.
+
+    Each integer constant is a GQ code, so ``4+376`` becomes
+    ``g.get(4, 0.0) + g.get(376, 0.0)`` where ``g`` is the GQ data dict
+    supplied at evaluation time. Missing codes default to 0.0, matching
+    the previous string-substitution behaviour.
+    """
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, int) and not isinstance(node.value, bool):
+            return ast.Call(
+                func=ast.Attribute(
+                    value=ast.Name(id="g", ctx=ast.Load()),
+                    attr="get",
+                    ctx=ast.Load(),
+                ),
+                args=[ast.Constant(value=node.value), ast.Constant(value=0.0)],
+                keywords=[],
+            )
+        return node
+
+
 class MappingEngine:
     """Core logic engine for applying mapping rules."""
 
@@ -25,18 +76,206 @@ class MappingEngine:
         """
         self.rules_filepath = Path(rules_filepath)
 
-        if not self.rules_filepath.exists():
-            raise FileNotFoundError(f"Rules file not found: {rules_filepath}")
+        # A single stat() validates existence without an exists() call
+        try:
+            self.rules_filepath.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Rules file not found: {rules_filepath}") from None
+
+        self.rules = load_yaml_cached(self.rules_filepath)
+
+        # Pre-compile every rule formula once at load time so that
+        # generate_report only calls cached evaluator functions instead
+        # of re-parsing formula strings on every invocation. Rules are
+        # flattened into (dsd_code, formula, description, evaluator,
+        # linear) tuples so the report loop does tuple unpacking instead
+        # of three dict string-key lookups per rule. `linear` holds
+        # (codes, signs) arrays for formulas that are pure sums of signed
+        # codes - the common case - which evaluate as a numpy
+        # gather-and-reduce instead of interpreted bytecode.
+        self._formula_cache: Dict[str, object] = {}
+        self._compiled_rules: Dict[str, List[tuple]] = {}
+        # Codes referenced by each rule's formula, extracted once here so
+        # validate_rules never re-runs the regex over the rule file
+        self._formula_codes: Dict[str, List[tuple]] = {"lbsr": [], "lbsn": []}
+        self._max_code = 0
+        for report_type in ("lbsr", "lbsn"):
+            compiled = []
+            for rule in self.rules.get(f"{report_type}_mappings", []) or []:
+                try:
+                    dsd_code = rule["dsd_code"]
+                    formula = rule["formula"]
+                    description = rule["description"]
+                except KeyError as e:
+                    raise ValueError(f"Missing required field in mapping rule: {e}")
+
+                evaluator = self._formula_cache.get(formula)
+                if evaluator is None:
+                    try:
+                        evaluator = self._compile_formula(formula)
+                    except (SyntaxError, ValueError) as e:
+                        raise ValueError(
+                            f"Invalid formula '{formula}' in rule {dsd_code}: {str(e)}"
+                        )
+                    self._formula_cache[formula] = evaluator
+
+                linear = self._lower_linear(formula)
+                if linear is not None:
+                    self._max_code = max(self._max_code, int(linear[0].max()))
+
+                compiled.append((dsd_code, formula, description, evaluator, linear))
+                self._formula_codes[report_type].append(
+                    (
+                        dsd_code,
+                        formula,
+                        tuple(dict.fromkeys(
+                            int(code) for code in _CODE_RE.findall(formula)
+                        )),
+                    )
+                )
+            self._compiled_rules[report_type] = compiled
+
+        # Batch each report type's linear rules into padded code/sign
+        # matrices so generate_report computes all of them with a single
+        # vectorized gather and row-wise reduction
+        self._linear_batches: Dict[str, Optional[tuple]] = {
+            report_type: self._build_linear_batch(compiled)
+            for report_type, compiled in self._compiled_rules.items()
+        }
+
+    @staticmethod
+    def _build_linear_batch(compiled_rules: List[tuple]) -> Optional[tuple]:
+        """
+        Pack a rule set's linear rules into padded code/sign matrices.
+
+        Each linear rule occupies one matrix row, right-padded with code 0
+        and sign 0.0 so the padding contributes nothing to the reduction.
+
+        Args:
+            compiled_rules: Compiled rule tuples for one report type
+
+        Returns:
+            Tuple of (rule_indices, codes_matrix, signs_matrix), or None
+            when the rule set has no linear rules
+        """
+        linear_indices = [
+            i for i, rule in enumerate(compiled_rules) if rule[4] is not None
+        ]
+        if not linear_indices:
+            return None
+
+        max_terms = max(len(compiled_rules[i][4][0]) for i in linear_indices)
+        codes_matrix = np.zeros((len(linear_indices), max_terms), dtype=np.int64)
+        signs_matrix = np.zeros((len(linear_indices), max_terms), dtype=np.float64)
 
-        with open(self.rules_filepath, "r") as f:
-            self.rules = yaml.safe_load(f)
+        for row, i in enumerate(linear_indices):
+            codes, signs = compiled_rules[i][4]
+            codes_matrix[row, : len(codes)] = codes
+            signs_matrix[row, : len(signs)] = signs
+
+        return linear_indices, codes_matrix, signs_matrix
+
+    @staticmethod
+    def _lower_linear(formula: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lower a formula to (codes, signs) arrays when it is linear.
+
+        A formula is linear when it consists only of additions and
+        subtractions of GQ codes (parentheses included), e.g.
+        "201+208+(17-517)". Such formulas evaluate as a dense-array
+        gather and signed sum instead of running compiled bytecode.
+
+        Args:
+            formula: Formula string to lower
+
+        Returns:
+            Tuple of (codes, signs) numpy arrays, or None when the
+            formula uses multiplication, division, or other constructs
+        """
+        try:
+            tree = ast.parse(formula.strip(), mode="eval")
+        except SyntaxError:
+            return None
+
+        terms: List[Tuple[int, float]] = []
+
+        def collect(node, sign):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+                collect(node.left, sign)
+                collect(node.right, sign if isinstance(node.op, ast.Add) else -sign)
+            elif isinstance(node, ast.UnaryOp) and isinstance(
+                node.op, (ast.UAdd, ast.USub)
+            ):
+                collect(node.operand, sign if isinstance(node.op, ast.UAdd) else -sign)
+            elif (
+                isinstance(node, ast.Constant)
+                and isinstance(node.value, int)
+                and not isinstance(node.value, bool)
+            ):
+                terms.append((node.value, float(sign)))
+            else:
+                raise ValueError("not a linear formula")
+
+        try:
+            collect(tree.body, 1)
+        except ValueError:
+            return None
+
+        codes = np.array([code for code, _ in terms], dtype=np.int64)
+        signs = np.array([sign for _, sign in terms], dtype=np.float64)
+        return codes, signs
+
+    def _compile_formula(self, formula: str):
+        """
+        Compile a formula string into a reusable evaluator function.
+
+        The formula is parsed into an AST, validated against a whitelist of
+        arithmetic node types, and its integer literals rewritten into
+        dictionary lookups against the GQ data supplied at evaluation time.
+        The expression is then wrapped in a lambda taking the GQ data dict,
+        so each evaluation is a plain function call rather than a frame
+        set-up through eval().
+
+        Args:
+            formula: Formula string to compile
+
+        Returns:
+            Callable taking a GQ data dict and returning the formula value
+        """
+        # Leading whitespace is an indentation error in eval mode
+        tree = ast.parse(formula.strip(), mode="eval")
+
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_FORMULA_NODES):
+                raise ValueError(f"Formula contains invalid syntax: {formula}")
+
+        tree = _CodeLookupTransformer().visit(tree)
+
+        # Wrap the rewritten expression as `lambda g: <expr>` and evaluate
+        # the compiled wrapper once, yielding a reusable function object
+        lam = ast.Expression(
+            body=ast.Lambda(
+                args=ast.arguments(
+                    posonlyargs=[],
+                    args=[ast.arg(arg="g")],
+                    kwonlyargs=[],
+                    kw_defaults=[],
+                    defaults=[],
+                ),
+                body=tree.body,
+            )
+        )
+        ast.fix_missing_locations(lam)
+        return eval(compile(lam, "<formula>", "eval"), {"__builtins__": {}})
 
     def _evaluate_formula(self, formula: str, gq_data: Dict[int, float]) -> float:
         """
         Safely evaluate a formula string using GQ data.
 
-        This method parses formulas like "4+376" or "201+208+215+221+(17-517)+230"
-        and evaluates them using the provided GQ data.
+        This method evaluates formulas like "4+376" or
+        "201+208+215+221+(17-517)+230" against the provided GQ data.
+        Formulas seen at load time are served from the pre-compiled cache;
+        new formulas are compiled once and cached for subsequent calls.
 
         Args:
             formula: Formula string to evaluate
@@ -46,43 +285,58 @@ class MappingEngine:
             Computed value from the formula
         """
         try:
-            # Remove whitespace
-            formula = formula.replace(" ", "")
-
-            # Find all numeric codes in the formula
-            # This regex finds sequences of digits
-            code_pattern = r"\b\d+\b"
-            codes = re.findall(code_pattern, formula)
-
-            # Replace each code with its value from gq_data
-            # Use placeholder approach to avoid substring replacement conflicts
-            evaluated_formula = formula
-
-            # First pass: replace codes with unique placeholders
-            placeholders = {}
-            for i, code_str in enumerate(codes):
-                placeholder = f"__PLACEHOLDER_{i}__"
-                placeholders[placeholder] = gq_data.get(int(code_str), 0.0)
-                pattern = r"\b" + re.escape(code_str) + r"\b"
-                evaluated_formula = re.sub(pattern, placeholder, evaluated_formula)
-
-            # Second pass: replace placeholders with actual values
-            for placeholder, value in placeholders.items():
-                evaluated_formula = evaluated_formula.replace(placeholder, str(value))
-
-            # Now evaluate the mathematical expression
-            # For safety, only allow basic arithmetic operations
-            allowed_chars = set("0123456789+-*/.() ")
-            if not all(c in allowed_chars for c in evaluated_formula):
-                raise ValueError(f"Formula contains invalid characters: {formula}")
-
-            # Evaluate using eval() - this is safe since we've sanitized the input
-            result = eval(evaluated_formula)
-            return float(result)
+            evaluator = self._formula_cache.get(formula)
+            if evaluator is None:
+                evaluator = self._compile_formula(formula)
+                self._formula_cache[formula] = evaluator
+
+            # Safe by construction: the compiled function only contains
+            # arithmetic and g.get(...) lookups, with builtins disabled.
+            return float(evaluator(gq_data))
 
         except Exception as e:
             raise ValueError(f"Error evaluating formula '{formula}': {str(e)}")
 
+    def _evaluate_formulas_parallel(
+        self, compiled_rules: List[tuple], gq_data: Dict[int, float]
+    ) -> Dict[str, float]:
+        """
+        Evaluate the distinct non-linear formulas of a rule set on a
+        thread pool.
+
+        Linear formulas are excluded: the batched einsum in
+        generate_report computes all of them in one vectorized pass, and
+        re-evaluating them here as bytecode would only duplicate that
+        work. Formulas that fail to evaluate are left out of the returned
+        cache; the sequential loop in generate_report re-evaluates them
+        so the error is raised with the owning rule's context, exactly as
+        in the single-threaded path.
+
+        Args:
+            compiled_rules: Compiled rule tuples whose formulas to evaluate
+            gq_data: Dictionary mapping GQ codes to values
+
+        Returns:
+            Dictionary mapping formula strings to their computed values
+        """
+        formulas = list(dict.fromkeys(
+            rule[1] for rule in compiled_rules if rule[4] is None
+        ))
+
+        results: Dict[str, float] = {}
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {
+                formula: executor.submit(self._evaluate_formula, formula, gq_data)
+                for formula in formulas
+            }
+            for formula, future in futures.items():
+                try:
+                    results[formula] = future.result()
+                except ValueError:
+                    pass
+
+        return results
+
     def generate_report(
         self, gq_data: Dict[int, float], report_type: str
     ) -> List[DSDDataPoint]:
@@ -102,19 +356,58 @@ class MappingEngine:
             )
 
         mapped_data = []
-        mapping_key = f"{report_type}_mappings"
-        mapping_rules = self.rules.get(mapping_key, [])
+        compiled_rules = self._compiled_rules.get(report_type, [])
 
-        if not mapping_rules:
+        if not compiled_rules:
             raise ValueError(f"No mapping rules found for report type: {report_type}")
 
-        for rule in mapping_rules:
-            try:
-                dsd_code = rule["dsd_code"]
-                formula = rule["formula"]
-                description = rule["description"]
+        # Rule sets often reuse the same sub-formula across aggregations;
+        # since gq_data is fixed for this report, each distinct formula
+        # only needs to be evaluated once. Large rule sets pre-fill the
+        # cache for their non-linear formulas from a thread pool -
+        # evaluations are independent of one another, so the map
+        # parallelizes trivially. Linear formulas stay out of the pool;
+        # the einsum batch below computes them all at once.
+        if len(compiled_rules) > _PARALLEL_THRESHOLD:
+            result_cache = self._evaluate_formulas_parallel(compiled_rules, gq_data)
+        else:
+            result_cache = {}
+
+        # One gather plus row-wise signed sum computes every linear rule
+        # in the report simultaneously. The GQ data is first scattered
+        # into a dense value array; codes missing from gq_data stay 0.0,
+        # matching the g.get(code, 0.0) fallback.
+        linear_results: Dict[int, float] = {}
+        batch = self._linear_batches.get(report_type)
+        if batch is not None:
+            values_arr = np.zeros(self._max_code + 1, dtype=np.float64)
+            if gq_data:
+                data_codes = np.fromiter(
+                    gq_data.keys(), dtype=np.int64, count=len(gq_data)
+                )
+                data_values = np.fromiter(
+                    gq_data.values(), dtype=np.float64, count=len(gq_data)
+                )
+                in_range = (data_codes >= 0) & (data_codes <= self._max_code)
+                values_arr[data_codes[in_range]] = data_values[in_range]
 
-                value = self._evaluate_formula(formula, gq_data)
+            linear_indices, codes_matrix, signs_matrix = batch
+            batch_values = np.einsum(
+                "ij,ij->i", values_arr[codes_matrix], signs_matrix
+            )
+            linear_results = dict(zip(linear_indices, batch_values.tolist()))
+
+        for i, (dsd_code, formula, description, evaluator, linear) in enumerate(
+            compiled_rules
+        ):
+            try:
+                value = result_cache.get(formula)
+                if value is None:
+                    if i in linear_results:
+                        value = float(linear_results[i])
+                    else:
+                        value = float(evaluator(gq_data))
+                    result_cache[formula] = value
 
                 mapped_data.append(
                     DSDDataPoint(
@@ -125,11 +418,9 @@ class MappingEngine:
                     )
                 )
 
-            except KeyError as e:
-                raise ValueError(f"Missing required field in mapping rule: {e}")
             except Exception as e:
                 raise ValueError(
-                    f"Error processing rule for {rule.get('dsd_code', 'unknown')}: {str(e)}"
+                    f"Error processing rule for {dsd_code}: {str(e)}"
                 )
 
         return mapped_data
@@ -147,20 +438,8 @@ class MappingEngine:
         errors = []
         gq_code_set = set(gq_codes)
 
-        for report_type in ["lbsr", "lbsn"]:
-            mapping_key = f"{report_type}_mappings"
-            mapping_rules = self.rules.get(mapping_key, [])
-
-            for rule in mapping_rules:
-                formula = rule.get("formula", "")
-                dsd_code = rule.get("dsd_code", "unknown")
-
-                # Extract all numeric codes from the formula
-                code_pattern = r"\b\d+\b"
-                formula_codes = [
-                    int(code) for code in re.findall(code_pattern, formula)
-                ]
-
+        for report_type, rules in self._formula_codes.items():
+            for dsd_code, formula, formula_codes in rules:
                 # Check if all codes exist in the available GQ codes
                 missing_codes = [
                     code for code in formula_codes if code not in gq_code_set
@@ -5,11 +5,12 @@ This module defines the core data structures used throughout the application
 for representing GQ data items and DSD data points.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class GQDataItem:
     """Represents a single data item from the GQ return."""
     code: int
@@ -18,12 +19,108 @@ class GQDataItem:
     part: Optional[str] = None
     category: Optional[str] = None
     counterparty: Optional[str] = None
+    # Lazily computed hash, cached since the instance is frozen
+    _hash: Optional[int] = field(default=None, init=False, repr=False)
 
+    _FIELDS = ('code', 'value', 'description', 'part', 'category',
+               'counterparty')
 
-@dataclass
+    def __post_init__(self):
+        # Descriptions and metadata repeat heavily across records;
+        # interning dedups their storage and lets string equality fall
+        # back to a pointer compare
+        setattr_ = object.__setattr__
+        setattr_(self, 'description', sys.intern(self.description))
+        for name in ('part', 'category', 'counterparty'):
+            value = getattr(self, name)
+            if value is not None:
+                setattr_(self, name, sys.intern(value))
+
+    @classmethod
+    def _make(cls, values: tuple) -> 'GQDataItem':
+        """
+        Build an instance from a tuple of all six field values.
+
+        Bypasses the generated ``__init__`` and its keyword binding, which
+        dominates construction cost when materializing items in bulk.
+        """
+        obj = cls.__new__(cls)
+        setattr_ = object.__setattr__
+        for name, value in zip(cls._FIELDS, values):
+            setattr_(obj, name, value)
+        setattr_(obj, '_hash', None)
+        obj.__post_init__()
+        return obj
+
+    def _key(self) -> tuple:
+        return (
+            self.code,
+            self.value,
+            self.description,
+            self.part,
+            self.category,
+            self.counterparty,
+        )
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = hash(self._key())
+            object.__setattr__(self, '_hash', h)
+        return h
+
+    def __eq__(self, other) -> bool:
+        # Identity compares in one pointer check - the common case when
+        # items are shared from a cache
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        # Unequal hashes reject in one integer compare; only likely-equal
+        # instances pay for the field-by-field comparison
+        if hash(self) != hash(other):
+            return False
+        return self._key() == other._key()
+
+
+@dataclass(slots=True, frozen=True, eq=False)
 class DSDDataPoint:
     """Represents a mapped data point in the DSD format."""
     code: str
     value: float
     description: str
-    formula: Optional[str] = None
\ No newline at end of file
+    formula: Optional[str] = None
+    # Lazily computed hash, cached since the instance is frozen
+    _hash: Optional[int] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        # Descriptions and formulas repeat across report runs; interning
+        # dedups their storage and lets string equality fall back to a
+        # pointer compare
+        setattr_ = object.__setattr__
+        setattr_(self, 'description', sys.intern(self.description))
+        if self.formula is not None:
+            setattr_(self, 'formula', sys.intern(self.formula))
+
+    def _key(self) -> tuple:
+        return (self.code, self.value, self.description, self.formula)
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = hash(self._key())
+            object.__setattr__(self, '_hash', h)
+        return h
+
+    def __eq__(self, other) -> bool:
+        # Identity compares in one pointer check - the common case when
+        # items are shared from a cache
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        # Unequal hashes reject in one integer compare; only likely-equal
+        # instances pay for the field-by-field comparison
+        if hash(self) != hash(other):
+            return False
+        return self._key() == other._key()
@@ -5,96 +5,575 @@ This module contains parsers for reading and structuring input data from
 GQ returns and configuration files.
 """
 
-import pandas as pd
-import yaml
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
 from pathlib import Path
 
+from .config import load_yaml_cached
 from .models import GQDataItem
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# numpy and pandas are imported lazily inside the methods that need them:
+# importing pandas alone costs several hundred ms, which would otherwise
+# be paid by every CLI invocation including --help
+
+# Lazily built row-filter kernel shared by all parser instances
+_row_filter = None
+
+
+def _get_row_filter():
+    """
+    Build (once) the vectorized row filter for the Excel chunk path.
+
+    The kernel binary-searches each code against the sorted lookup array,
+    which beats np.isin's per-call sort for large structure files. When
+    numba is installed the kernel is JIT-compiled to machine code; numba
+    is optional, so the plain numpy version is the default.
+
+    Returns:
+        Function (codes, values, lookup) -> (kept_codes, kept_values)
+    """
+    global _row_filter
+    if _row_filter is not None:
+        return _row_filter
+
+    import numpy as np
+
+    def _filter_rows(codes, values, lookup):
+        if lookup.size == 0:
+            return codes[:0], values[:0]
+        idx = np.minimum(np.searchsorted(lookup, codes), lookup.size - 1)
+        ok = lookup[idx] == codes
+        return codes[ok], values[ok]
+
+    try:
+        from numba import njit
+        _row_filter = njit(cache=True)(_filter_rows)
+    except ImportError:
+        _row_filter = _filter_rows
+    return _row_filter
+
 
 class GQParser:
     """Parser for GQ Excel files with structure validation."""
     
-    def __init__(self, gq_filepath: str, structure_filepath: str):
+    def __init__(self, gq_filepath: str, structure_filepath: str,
+                 sheet_names: Optional[List[str]] = None):
         """
         Initialize the GQ parser.
-        
+
         Args:
             gq_filepath: Path to the GQ Excel file
             structure_filepath: Path to the GQ structure YAML file
+            sheet_names: For multi-sheet Excel workbooks, the sheets to
+                read, in order; all sheets share one workbook open. By
+                default only the first sheet is read.
         """
         self.gq_filepath = Path(gq_filepath)
         self.structure_filepath = Path(structure_filepath)
+        self.sheet_names = list(sheet_names) if sheet_names else None
         
-        # Validate file existence
-        if not self.gq_filepath.exists():
-            raise FileNotFoundError(f"GQ file not found: {gq_filepath}")
-        if not self.structure_filepath.exists():
-            raise FileNotFoundError(f"Structure file not found: {structure_filepath}")
+        # Validate file existence with a single stat() each; freshness
+        # checks take their own per-call stats via _stat_signature()
+        try:
+            self.gq_filepath.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"GQ file not found: {gq_filepath}") from None
+        try:
+            self.structure_filepath.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Structure file not found: {structure_filepath}"
+            ) from None
             
-        # Load structure configuration
-        with open(self.structure_filepath, 'r') as f:
-            self.structure = yaml.safe_load(f)
+        # Load structure configuration (cached on disk after first parse)
+        self.structure = load_yaml_cached(self.structure_filepath)
         
         # Create lookup for GQ codes
         self.gq_code_lookup = {
             item['code']: item for item in self.structure.get('gq_codes', [])
         }
-    
-    def parse(self) -> Dict[int, float]:
+
+        import numpy as np
+
+        # Cache the known codes as a sorted, contiguous int32 array: the
+        # membership mask in parse() runs as a vectorized comparison over
+        # it, sortedness admits binary-search lookups, and int32 halves
+        # the memory traffic versus int64 for large structure files. The
+        # dict above remains the metadata lookup and `in`-operator view.
+        self._lookup_codes_arr = np.array(
+            sorted(self.gq_code_lookup), dtype=np.int32
+        )
+
+        # Memoized parse results, keyed on the GQ file's stat signature so
+        # a rewrite of the file between calls invalidates them
+        self._parse_cache: Optional[tuple] = None
+        self._items_cache: Optional[tuple] = None
+
+        # Specialize the row-loop membership test for this session's
+        # codes: the generated function carries the frozenset as a
+        # default argument, so each call is one C-level hash probe with
+        # no attribute or closure lookups in the hot loop
+        namespace: Dict[str, object] = {}
+        exec(
+            compile(
+                "def _is_known_code(code, "
+                f"_codes={frozenset(self.gq_code_lookup)!r}):\n"
+                "    return code in _codes\n",
+                '<GQParser codegen>',
+                'exec',
+            ),
+            namespace,
+        )
+        self._is_known_code = namespace['_is_known_code']
+
+    def _stat_signature(self) -> tuple:
+        """Return the GQ file's (mtime_ns, size) freshness signature."""
+        st = self.gq_filepath.stat()
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _detect_columns(columns) -> tuple:
+        """
+        Identify the code and value columns from a header row.
+
+        Args:
+            columns: Sequence of column names
+
+        Returns:
+            Tuple of (code_index, value_index) into the header
+        """
+        # Look for code and value columns - try common patterns
+        code_columns = [i for i, col in enumerate(columns)
+                        if 'code' in str(col).lower()]
+        value_columns = [i for i, col in enumerate(columns)
+                         if any(term in str(col).lower()
+                                for term in ['value', 'amount', 'balance', 'total'])]
+
+        if not code_columns or not value_columns:
+            # Fallback: assume first two columns are code and value
+            if len(columns) >= 2:
+                return 0, 1
+            raise ValueError("Unable to identify code and value columns")
+
+        return code_columns[0], value_columns[0]
+
+    def _iter_rows_csv(self):
+        """
+        Stream raw rows from the GQ CSV file, header row first.
+
+        Yields:
+            Lists of cell strings, one per row
+        """
+        import csv
+
+        with open(self.gq_filepath, newline='') as f:
+            yield from csv.reader(f)
+
+    def _parse_csv_pyarrow(self) -> Optional[Dict[int, float]]:
+        """
+        Parse the CSV with pyarrow's multithreaded reader, if possible.
+
+        pyarrow's C++ reader parses column chunks in parallel and hands
+        back typed arrays with no per-cell boxing. Files it cannot handle
+        cleanly - dirty numeric columns, ragged rows, or pyarrow simply
+        not being installed - fall back to the tolerant stdlib path.
+
+        Returns:
+            Dictionary mapping GQ codes to their values, or None when the
+            stdlib reader should be used instead
+        """
+        try:
+            from pyarrow import csv as pa_csv
+            import pyarrow.types as pa_types
+        except ImportError:
+            return None
+
+        import numpy as np
+
+        try:
+            table = pa_csv.read_csv(self.gq_filepath)
+        except Exception:
+            # Let the row-by-row reader produce its usual behavior/errors
+            return None
+
+        code_idx, value_idx = self._detect_columns(table.column_names)
+        code_col = table.column(code_idx)
+        value_col = table.column(value_idx)
+
+        for column in (code_col, value_col):
+            if not (pa_types.is_integer(column.type)
+                    or pa_types.is_floating(column.type)):
+                return None
+
+        codes = code_col.to_numpy(zero_copy_only=False)
+        values = value_col.to_numpy(zero_copy_only=False).astype(np.float64)
+
+        # Null codes surface as NaN in a float array; drop those rows
+        if codes.dtype.kind == 'f':
+            valid = ~np.isnan(codes)
+            codes = codes[valid]
+            values = values[valid]
+        codes = codes.astype(np.int64)
+        values = np.nan_to_num(values, nan=0.0)
+
+        known = np.isin(codes, self._lookup_codes_arr)
+        return dict(zip(codes[known].tolist(), values[known].tolist()))
+
+    def _parse_csv(self) -> Dict[int, float]:
+        """
+        Stream a CSV GQ file into a code/value dictionary.
+
+        Prefers pyarrow's multithreaded reader when it is installed and
+        the file is clean; otherwise uses the C-implemented stdlib csv
+        reader directly - for a narrow code/value file, pandas' dtype
+        inference and DataFrame construction cost more than the parse
+        itself, and streaming keeps memory flat regardless of file size.
+
+        Returns:
+            Dictionary mapping GQ codes to their values
+        """
+        import csv
+
+        gq_data = self._parse_csv_pyarrow()
+        if gq_data is not None:
+            return gq_data
+
+        with open(self.gq_filepath, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("Unable to identify code and value columns")
+            code_idx, value_idx = self._detect_columns(header)
+
+            def typed_rows():
+                # Converted (code, value) pairs; rows with invalid data
+                # are skipped
+                for row in reader:
+                    try:
+                        yield (
+                            int(float(row[code_idx])),
+                            float(row[value_idx]) if row[value_idx] else 0.0,
+                        )
+                    except (ValueError, IndexError):
+                        continue
+
+            # Only include codes that are in our structure definition
+            is_known = self._is_known_code
+            return {code: value for code, value in typed_rows() if is_known(code)}
+
+    def _iter_rows_xlsx(self):
+        """
+        Stream worksheet rows from the GQ Excel file.
+
+        Prefers the Rust-backed python-calamine reader, which streams the
+        sheet XML without building a DOM and is several times faster than
+        openpyxl on real GQ workbooks. Without calamine, the stdlib-only
+        SAX reader in _fastxlsx is tried next, with openpyxl's read-only
+        mode as the last resort. Every path keeps memory bounded
+        regardless of sheet size.
+
+        When sheet_names was given, the requested sheets are streamed
+        back to back from a single workbook open, so the zip directory
+        and shared-strings table are only decoded once. Later sheets'
+        header rows are skipped downstream by the usual invalid-row
+        tolerance.
+
+        Yields:
+            Sequences of cell values, one per row
+        """
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            if self.sheet_names:
+                # The SAX reader only handles the first sheet
+                yield from self._iter_rows_xlsx_openpyxl()
+            else:
+                yield from self._iter_rows_xlsx_fallback()
+            return
+
+        workbook = CalamineWorkbook.from_path(str(self.gq_filepath))
+        if self.sheet_names:
+            for name in self.sheet_names:
+                yield from workbook.get_sheet_by_name(name).to_python()
+        else:
+            yield from workbook.get_sheet_by_index(0).to_python()
+
+    def _iter_rows_xlsx_fallback(self):
+        """
+        Stream worksheet rows without calamine.
+
+        Tries the stdlib SAX reader first and only falls back to openpyxl
+        for workbooks it cannot open; the probe reads just the first row,
+        so no rows are duplicated on fallback.
+
+        Yields:
+            Sequences of cell values, one per row
+        """
+        from ._fastxlsx import iter_rows
+
+        try:
+            rows = iter_rows(self.gq_filepath)
+            first = next(rows, None)
+        except Exception:
+            # Unusual archive layout or sheet XML - let openpyxl try
+            yield from self._iter_rows_xlsx_openpyxl()
+            return
+
+        if first is not None:
+            yield first
+            yield from rows
+
+    def _iter_rows_xlsx_openpyxl(self):
+        """
+        Stream worksheet rows with openpyxl in read-only mode.
+
+        Yields:
+            Tuples of cell values, one per row
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(
+            self.gq_filepath, read_only=True, data_only=True
+        )
+        try:
+            if self.sheet_names:
+                sheets = [workbook[name] for name in self.sheet_names]
+            else:
+                sheets = [workbook.active]
+            for sheet in sheets:
+                for row in sheet.iter_rows(values_only=True):
+                    yield row
+        finally:
+            workbook.close()
+
+    def _read_parquet_cache(self, src_mtime_ns: int) -> Optional[Dict[int, float]]:
+        """
+        Load Excel rows from the Parquet sidecar cache, if fresh.
+
+        The sidecar holds the sheet's raw code/value rows before any
+        structure filtering; the filter runs on every read, so an edited
+        structure YAML (or a parser with a different one) always sees its
+        own view of the data without the cache going stale.
+
+        Args:
+            src_mtime_ns: The GQ file's current mtime, from the stat
+                parse() already takes for its own memo key
+
+        Returns:
+            Filtered code/value dictionary, or None when the cache is
+            missing, stale, or no Parquet engine is installed
+        """
+        if self.sheet_names:
+            # The sidecar is keyed by source file only; a custom sheet
+            # selection must not read another selection's cache
+            return None
+
+        cache_path = self.gq_filepath.with_suffix('.parquet')
+
+        try:
+            if cache_path.stat().st_mtime_ns >= src_mtime_ns:
+                import pandas as pd
+                # Request only the two columns we use, so extra columns in
+                # a hand-produced cache are never materialized
+                df = pd.read_parquet(cache_path, columns=['code', 'value'])
+                codes, values = _get_row_filter()(
+                    df['code'].to_numpy(dtype='int64'),
+                    df['value'].to_numpy(dtype='float64'),
+                    self._lookup_codes_arr,
+                )
+                return dict(zip(codes.tolist(), values.tolist()))
+        except (OSError, ImportError, ValueError, KeyError):
+            # Missing/stale cache or no parquet engine - read the xlsx
+            pass
+
+        return None
+
+    def _write_parquet_cache(self, codes, values) -> None:
+        """
+        Write raw Excel rows to the Parquet sidecar cache.
+
+        Args:
+            codes: int64 array of all code cells in the sheet
+            values: float64 array of the corresponding value cells
+        """
+        if self.sheet_names:
+            return
+
+        cache_path = self.gq_filepath.with_suffix('.parquet')
+
+        try:
+            import pandas as pd
+            # Explicit dtypes keep the cache compact and skip inference
+            # on the way back in
+            pd.DataFrame({'code': codes, 'value': values}).to_parquet(cache_path)
+        except (ImportError, ValueError, OSError):
+            # No parquet engine installed or cache not writable - not fatal
+            pass
+
+    def _parse_excel(self, chunksize: int, src_mtime_ns: int) -> Dict[int, float]:
+        """
+        Parse the GQ Excel file by streaming rows in bounded chunks.
+
+        Rows are accumulated up to ``chunksize`` at a time and filtered
+        against the structure codes with a vectorized numpy mask. The raw
+        pre-filter rows are kept as compact typed arrays and written to
+        the Parquet sidecar, so subsequent runs skip the xlsx parse while
+        still applying whatever structure file they were built with.
+
+        Args:
+            chunksize: Number of rows to accumulate per filtering pass
+            src_mtime_ns: The GQ file's current mtime, used as the
+                sidecar freshness bound
+
+        Returns:
+            Dictionary mapping GQ codes to their values
+        """
+        import numpy as np
+
+        cached = self._read_parquet_cache(src_mtime_ns)
+        if cached is not None:
+            return cached
+
+        gq_data: Dict[int, float] = {}
+        chunk_codes: list = []
+        chunk_values: list = []
+        raw_code_chunks: list = []
+        raw_value_chunks: list = []
+        filter_rows = _get_row_filter()
+        lookup_arr = self._lookup_codes_arr
+
+        def flush_chunk():
+            codes_arr = np.array(chunk_codes, dtype=np.int64)
+            values_arr = np.array(chunk_values, dtype=np.float64)
+            # Keep the unfiltered rows for the sidecar write; at 16 bytes
+            # per row this is far cheaper than the Python lists they came
+            # from
+            raw_code_chunks.append(codes_arr)
+            raw_value_chunks.append(values_arr)
+            codes, values = filter_rows(codes_arr, values_arr, lookup_arr)
+            gq_data.update(zip(codes.tolist(), values.tolist()))
+            chunk_codes.clear()
+            chunk_values.clear()
+
+        code_idx = value_idx = None
+        for row in self._iter_rows_xlsx():
+            if code_idx is None:
+                # First row is the header
+                code_idx, value_idx = self._detect_columns(row)
+                continue
+
+            try:
+                code = int(float(row[code_idx]))
+                # Empty value cells count as 0.0, matching the CSV path.
+                # They surface differently per engine: openpyxl yields
+                # None, calamine an empty string, and the SAX reader a
+                # short row with the cell missing entirely.
+                raw_value = row[value_idx] if value_idx < len(row) else None
+                value = (
+                    float(raw_value) if raw_value not in (None, '') else 0.0
+                )
+            except (TypeError, ValueError, IndexError):
+                # Skip rows with invalid data
+                continue
+
+            chunk_codes.append(code)
+            chunk_values.append(value)
+            if len(chunk_codes) >= chunksize:
+                flush_chunk()
+
+        if chunk_codes:
+            flush_chunk()
+
+        if raw_code_chunks:
+            self._write_parquet_cache(
+                np.concatenate(raw_code_chunks), np.concatenate(raw_value_chunks)
+            )
+        else:
+            self._write_parquet_cache(
+                np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+            )
+        return gq_data
+
+    def parse(self, chunksize: int = 100_000) -> Dict[int, float]:
         """
         Parse the GQ Excel file and extract numeric codes with their values.
-        
+
+        Args:
+            chunksize: Rows to accumulate per filtering pass for Excel
+                files; CSVs always stream row by row
+
         Returns:
             Dictionary mapping GQ codes to their values
         """
+        signature = self._stat_signature()
+        if self._parse_cache is not None and self._parse_cache[0] == signature:
+            # Hand back a copy so callers mutating the result cannot
+            # poison the cache
+            return dict(self._parse_cache[1])
+
         try:
-            # Read the Excel file - handle different possible formats
-            if self.gq_filepath.suffix.lower() == '.xlsx':
-                df = pd.read_excel(self.gq_filepath)
-            elif self.gq_filepath.suffix.lower() == '.csv':
-                df = pd.read_csv(self.gq_filepath)
+            # Both formats stream: CSVs row by row through the stdlib csv
+            # module, Excel in bounded chunks through openpyxl read-only
+            # mode, so multi-GB returns no longer need to fit in memory
+            suffix = self.gq_filepath.suffix.lower()
+            if suffix == '.xlsx':
+                gq_data = self._parse_excel(chunksize, signature[0])
+            elif suffix == '.csv':
+                gq_data = self._parse_csv()
             else:
                 raise ValueError(f"Unsupported file format: {self.gq_filepath.suffix}")
-            
-            gq_data = {}
-            
-            # Look for code and value columns - try common patterns
-            code_columns = [col for col in df.columns if 'code' in col.lower()]
-            value_columns = [col for col in df.columns if any(term in col.lower() 
-                           for term in ['value', 'amount', 'balance', 'total'])]
-            
-            if not code_columns or not value_columns:
-                # Fallback: assume first two columns are code and value
-                if len(df.columns) >= 2:
-                    code_col = df.columns[0]
-                    value_col = df.columns[1]
-                else:
-                    raise ValueError("Unable to identify code and value columns")
+
+        except Exception as e:
+            raise ValueError(f"Error parsing GQ file {self.gq_filepath}: {str(e)}")
+
+        self._parse_cache = (signature, dict(gq_data))
+        return gq_data
+
+    def list_codes(self) -> Set[int]:
+        """
+        Extract only the set of GQ codes present in the file.
+
+        Cheaper than parse() when values are not needed (e.g. the CLI's
+        --validate-only run): only the code column is read and all value
+        conversions are skipped.
+
+        Returns:
+            Set of GQ codes found in the file that exist in the structure
+        """
+        try:
+            suffix = self.gq_filepath.suffix.lower()
+            if suffix == '.xlsx':
+                rows = self._iter_rows_xlsx()
+            elif suffix == '.csv':
+                rows = self._iter_rows_csv()
             else:
-                code_col = code_columns[0]
-                value_col = value_columns[0]
-            
-            # Extract data, handling potential data quality issues
-            for _, row in df.iterrows():
+                raise ValueError(f"Unsupported file format: {self.gq_filepath.suffix}")
+
+            codes: Set[int] = set()
+            is_known = self._is_known_code
+            code_idx = None
+            for row in rows:
+                if code_idx is None:
+                    # First row is the header
+                    code_idx, _ = self._detect_columns(row)
+                    continue
+
                 try:
-                    code = int(row[code_col])
-                    value = float(row[value_col]) if pd.notna(row[value_col]) else 0.0
-                    
-                    # Only include codes that are in our structure definition
-                    if code in self.gq_code_lookup:
-                        gq_data[code] = value
-                        
-                except (ValueError, TypeError):
-                    # Skip rows with invalid data
+                    code = int(float(row[code_idx]))
+                except (TypeError, ValueError, IndexError):
                     continue
-            
-            return gq_data
-            
+
+                if is_known(code):
+                    codes.add(code)
+
+            return codes
+
         except Exception as e:
             raise ValueError(f"Error parsing GQ file {self.gq_filepath}: {str(e)}")
-    
+
     def get_gq_items(self) -> List[GQDataItem]:
         """
         Parse and return structured GQ data items with metadata.
@@ -102,20 +581,70 @@ class GQParser:
         Returns:
             List of GQDataItem objects with full metadata
         """
+        signature = self._stat_signature()
+        if self._items_cache is not None and self._items_cache[0] == signature:
+            # Items are frozen, so sharing them across copies is safe
+            return list(self._items_cache[1])
+
         gq_data = self.parse()
-        items = []
-        
-        for code, value in gq_data.items():
-            if code in self.gq_code_lookup:
-                structure_info = self.gq_code_lookup[code]
-                item = GQDataItem(
-                    code=code,
-                    value=value,
-                    description=structure_info.get('description', ''),
-                    part=structure_info.get('part'),
-                    category=structure_info.get('category'),
-                    counterparty=structure_info.get('counterparty')
-                )
-                items.append(item)
-        
-        return items
\ No newline at end of file
+        lookup = self.gq_code_lookup
+
+        def field_tuples():
+            # One tuple of field values per known code, in GQDataItem
+            # field order
+            for code, value in gq_data.items():
+                structure_info = lookup.get(code)
+                if structure_info is not None:
+                    yield (
+                        code,
+                        value,
+                        structure_info.get('description', ''),
+                        structure_info.get('part'),
+                        structure_info.get('category'),
+                        structure_info.get('counterparty'),
+                    )
+
+        # _make bypasses __init__'s per-instance keyword binding, which
+        # is the dominant cost when building items in bulk
+        items = list(map(GQDataItem._make, field_tuples()))
+
+        self._items_cache = (signature, tuple(items))
+        return items
+
+    def get_gq_frame(self) -> Dict[str, 'np.ndarray']:
+        """
+        Parse and return the GQ data as a columnar dict of numpy arrays.
+
+        Column-oriented layout lets downstream aggregations - sums,
+        filters by category, joins on code - run as vectorized numpy
+        operations instead of walking a list of Python objects. Columns
+        are ``code`` (int32), ``value`` (float64) and the ``description``,
+        ``part``, ``category`` and ``counterparty`` metadata (object),
+        all aligned row-wise.
+
+        Returns:
+            Dictionary mapping column names to same-length numpy arrays
+        """
+        import numpy as np
+
+        gq_data = self.parse()
+        lookup = self.gq_code_lookup
+        n = len(gq_data)
+
+        # parse() already filters to codes present in the structure, so
+        # every code here has a metadata entry
+        infos = [lookup[code] for code in gq_data]
+        return {
+            'code': np.fromiter(gq_data.keys(), dtype=np.int32, count=n),
+            'value': np.fromiter(gq_data.values(), dtype=np.float64, count=n),
+            'description': np.array(
+                [info.get('description', '') for info in infos], dtype=object
+            ),
+            'part': np.array([info.get('part') for info in infos], dtype=object),
+            'category': np.array(
+                [info.get('category') for info in infos], dtype=object
+            ),
+            'counterparty': np.array(
+                [info.get('counterparty') for info in infos], dtype=object
+            ),
+        }
\ No newline at end of file
@@ -5,15 +5,13 @@ Tests for BIS GQ Mapper parsers module.
 import pytest
 import pandas as pd
 import yaml
-import tempfile
-import os
 from pathlib import Path
 
 from src.parsers import GQParser
 from src.models import GQDataItem
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gq_structure():
     """Sample GQ structure configuration."""
     return {
@@ -25,7 +23,7 @@ def sample_gq_structure():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gq_data():
     """Sample GQ data as DataFrame."""
     return pd.DataFrame({
@@ -34,37 +32,58 @@ def sample_gq_data():
     })
 
 
-@pytest.fixture
-def temp_files(sample_gq_structure, sample_gq_data):
-    """Create temporary files for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create structure file
-        structure_file = Path(tmpdir) / 'structure.yaml'
-        with open(structure_file, 'w') as f:
-            yaml.dump(sample_gq_structure, f)
-        
-        # Create GQ Excel file
-        gq_file = Path(tmpdir) / 'gq_data.xlsx'
-        sample_gq_data.to_excel(gq_file, index=False)
-        
-        # Create CSV version too
-        csv_file = Path(tmpdir) / 'gq_data.csv'
-        sample_gq_data.to_csv(csv_file, index=False)
-        
-        yield {
-            'structure': str(structure_file),
-            'excel': str(gq_file),
-            'csv': str(csv_file),
-            'tmpdir': tmpdir
-        }
+@pytest.fixture(scope="session")
+def temp_files(tmp_path_factory, sample_gq_structure, sample_gq_data):
+    """Create shared input files once for the whole test session.
+
+    Writing the xlsx fixture is the most expensive set-up step in this
+    module, so the files are created a single time and shared; tests that
+    need different inputs write uniquely named siblings into the same
+    directory and never modify these shared files.
+    """
+    tmpdir = tmp_path_factory.mktemp("gq")
+
+    # Create structure file
+    structure_file = tmpdir / 'structure.yaml'
+    with open(structure_file, 'w') as f:
+        yaml.dump(sample_gq_structure, f)
+
+    # Create GQ Excel file - xlsxwriter streams the sheet XML and is
+    # noticeably faster than the openpyxl default writer. Note that
+    # xlsxwriter's constant_memory mode cannot be used with to_excel:
+    # pandas writes cells column by column, and constant-memory mode
+    # silently drops cells for rows it has already flushed.
+    gq_file = tmpdir / 'gq_data.xlsx'
+    sample_gq_data.to_excel(gq_file, index=False, engine='xlsxwriter')
+
+    # Create CSV version too
+    csv_file = tmpdir / 'gq_data.csv'
+    sample_gq_data.to_csv(csv_file, index=False)
+
+    return {
+        'structure': str(structure_file),
+        'excel': str(gq_file),
+        'csv': str(csv_file),
+        'tmpdir': str(tmpdir)
+    }
+
+
+@pytest.fixture(scope="session")
+def parser(temp_files):
+    """Shared read-only parser over the session fixture files.
+
+    Construction re-parses the structure YAML and rebuilds the code
+    lookup, so tests that only read from the parser share one instance;
+    tests exercising other inputs still build their own.
+    """
+    return GQParser(temp_files['excel'], temp_files['structure'])
 
 
 class TestGQParser:
     """Test cases for GQParser class."""
-    
-    def test_init_valid_files(self, temp_files):
+
+    def test_init_valid_files(self, parser):
         """Test parser initialization with valid files."""
-        parser = GQParser(temp_files['excel'], temp_files['structure'])
         assert parser.gq_filepath.exists()
         assert parser.structure_filepath.exists()
         assert len(parser.gq_code_lookup) == 3
@@ -82,9 +101,8 @@ class TestGQParser:
         with pytest.raises(FileNotFoundError):
             GQParser(temp_files['excel'], 'nonexistent.yaml')
     
-    def test_parse_excel_file(self, temp_files):
+    def test_parse_excel_file(self, parser):
         """Test parsing Excel file."""
-        parser = GQParser(temp_files['excel'], temp_files['structure'])
         gq_data = parser.parse()
         
         # Should only include codes that are in structure
@@ -104,9 +122,8 @@ class TestGQParser:
         assert gq_data[17] == 50.0
         assert gq_data[221] == 200.0
     
-    def test_get_gq_items(self, temp_files):
+    def test_get_gq_items(self, parser):
         """Test getting structured GQ items."""
-        parser = GQParser(temp_files['excel'], temp_files['structure'])
         items = parser.get_gq_items()
         
         assert len(items) == 3
@@ -123,6 +140,62 @@ class TestGQParser:
         item_221 = next(item for item in items if item.code == 221)
         assert item_221.counterparty == 'F'
     
+    def test_fastxlsx_reader(self, temp_files):
+        """Test the stdlib SAX xlsx reader against the shared fixture."""
+        from src._fastxlsx import iter_rows
+
+        rows = list(iter_rows(temp_files['excel']))
+
+        # Header row comes through as strings, data rows as numbers
+        assert rows[0][0] == 'Code'
+        assert rows[0][1] == 'Value'
+        data = {int(row[0]): float(row[1]) for row in rows[1:]}
+        assert data == {6: 1000.0, 17: 50.0, 221: 200.0, 999: 100.0}
+
+    def test_get_gq_frame(self, parser):
+        """Test getting the columnar view of GQ data."""
+        frame = parser.get_gq_frame()
+
+        assert set(frame) == {'code', 'value', 'description', 'part',
+                              'category', 'counterparty'}
+        assert all(len(col) == 3 for col in frame.values())
+
+        # Columns are row-aligned
+        codes = frame['code'].tolist()
+        idx = codes.index(6)
+        assert frame['value'][idx] == 1000.0
+        assert frame['description'][idx] == 'Total claims'
+        assert frame['category'][idx] == 'Total'
+        assert frame['counterparty'][codes.index(221)] == 'F'
+
+    def test_parse_excel_empty_value(self, temp_files):
+        """Test that empty value cells parse as 0.0, not dropped rows."""
+        df = pd.DataFrame({'Code': [6, 17], 'Value': [1000.0, None]})
+
+        empty_value_file = Path(temp_files['tmpdir']) / 'empty_value.xlsx'
+        df.to_excel(empty_value_file, index=False, engine='xlsxwriter')
+
+        parser = GQParser(str(empty_value_file), temp_files['structure'])
+        gq_data = parser.parse()
+
+        assert gq_data == {6: 1000.0, 17: 0.0}
+
+    def test_parse_multiple_sheets(self, temp_files):
+        """Test parsing selected sheets of a multi-sheet workbook."""
+        df1 = pd.DataFrame({'Code': [6], 'Value': [1000.0]})
+        df2 = pd.DataFrame({'Code': [17, 221], 'Value': [50.0, 200.0]})
+
+        multi_file = Path(temp_files['tmpdir']) / 'multi.xlsx'
+        with pd.ExcelWriter(multi_file, engine='xlsxwriter') as writer:
+            df1.to_excel(writer, sheet_name='PartI', index=False)
+            df2.to_excel(writer, sheet_name='PartII', index=False)
+
+        parser = GQParser(str(multi_file), temp_files['structure'],
+                          sheet_names=['PartI', 'PartII'])
+        gq_data = parser.parse()
+
+        assert gq_data == {6: 1000.0, 17: 50.0, 221: 200.0}
+
     def test_parse_unsupported_format(self, temp_files):
         """Test parsing unsupported file format."""
         # Create a file with unsupported extension